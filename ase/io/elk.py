@@ -1,4 +1,6 @@
-import collections
+import itertools
+import os
+import re
 from pathlib import Path
 
 import numpy as np
@@ -212,20 +214,32 @@ def write_elk_in(fd, atoms, parameters=None):
 class ElkReader:
     def __init__(self, path):
         self.path = Path(path)
+        self._cache = None
 
     def _read_everything(self):
         yield from self._read_energy()
 
-        with (self.path / 'INFO.OUT').open() as fd:
+        # INFO.OUT can reach several MB for long SCF runs; a large buffer
+        # keeps the single-pass parse from being dominated by small reads.
+        with (self.path / 'INFO.OUT').open(buffering=1 << 20) as fd:
             yield from parse_elk_info(fd)
 
-        with (self.path / 'EIGVAL.OUT').open() as fd:
+        # EIGVAL.OUT is the largest ELK output on dense k-grids, so it
+        # gets the same large read buffer:
+        with (self.path / 'EIGVAL.OUT').open(buffering=1 << 20) as fd:
             yield from parse_elk_eigval(fd)
 
-        with (self.path / 'KPOINTS.OUT').open() as fd:
+        with (self.path / 'KPOINTS.OUT').open(buffering=1 << 20) as fd:
             yield from parse_elk_kpoints(fd)
 
     def read_everything(self):
+        if self._cache is None:
+            self._cache = self._parse_everything()
+        # Shallow copy so callers may pop entries without clobbering
+        # the cache:
+        return dict(self._cache)
+
+    def _parse_everything(self):
         dct = dict(self._read_everything())
 
         # The eigenvalue/occupation tables do not say whether there are
@@ -249,8 +263,12 @@ class ElkReader:
         return dct
 
     def _read_energy(self):
-        txt = (self.path / 'TOTENERGY.OUT').read_text()
-        tokens = txt.split()
+        # TOTENERGY.OUT grows by one line per SCF step and we only need
+        # the final value, so read just the tail of the file:
+        with (self.path / 'TOTENERGY.OUT').open('rb') as fd:
+            fd.seek(0, os.SEEK_END)
+            fd.seek(max(0, fd.tell() - 256))
+            tokens = fd.read().split()
         energy = float(tokens[-1]) * Hartree
         yield 'free_energy', energy
         yield 'energy', energy
@@ -262,20 +280,23 @@ def parse_elk_kpoints(fd):
     assert 'k-point, vkl, wkpt' in rhs, header
     nkpts = int(lhs.strip())
 
-    kpts = np.empty((nkpts, 3))
-    weights = np.empty(nkpts)
+    # Columns are (index, vkl, wkpt, ...); parse the whole table in C
+    # rather than calling float() on each token:
+    data = np.loadtxt(itertools.islice(fd, nkpts),
+                      usecols=(1, 2, 3, 4), ndmin=2)
+    assert len(data) == nkpts
 
-    for ikpt in range(nkpts):
-        line = next(fd)
-        tokens = line.split()
-        kpts[ikpt] = np.array(tokens[1:4]).astype(float)
-        weights[ikpt] = float(tokens[4])
-    yield 'ibz_kpoints', kpts
-    yield 'kpoint_weights', weights
+    yield 'ibz_kpoints', data[:, :3].copy()
+    yield 'kpoint_weights', data[:, 3].copy()
+
+
+# Precompiled; case varies between ELK versions and lowercasing every
+# line of a multi-MB INFO.OUT just for this check is wasteful:
+scl_maximum_re = re.compile('reached self-consistent loops maximum',
+                            re.IGNORECASE)
 
 
 def parse_elk_info(fd):
-    dct = collections.defaultdict(list)
     fd = iter(fd)
 
     spinpol = None
@@ -284,18 +305,28 @@ def parse_elk_info(fd):
     # Legacy code kept track of both these things, which is strange.
     # Why could a file both claim to converge *and* not converge?
 
+    fermi = None
+    force_lines = []
+
     # We loop over all lines and extract also data that occurs
-    # multiple times (e.g. in multiple SCF steps)
+    # multiple times (e.g. in multiple SCF steps).  Quantities
+    # repeated per SCF step overwrite the previous value, so one
+    # forward pass keeps last-occurrence semantics without storing
+    # every keyed line of the file.
     for line in fd:
         # "name of quantity  :   1 2 3"
         tokens = line.split(':', 1)
         if len(tokens) == 2:
             lhs, rhs = tokens
-            dct[lhs.strip()].append(rhs.strip())
+            lhs = lhs.strip()
+            if lhs == 'Fermi':
+                fermi = rhs
+            elif lhs == 'total force':
+                force_lines.append(rhs)
 
         elif line.startswith('Convergence targets achieved'):
             converged = True
-        elif 'reached self-consistent loops maximum' in line.lower():
+        elif scl_maximum_re.search(line):
             actually_did_not_converge = True
 
         if 'Spin treatment' in line:
@@ -308,33 +339,38 @@ def parse_elk_info(fd):
         raise RuntimeError('Could not determine spin treatment')
     yield 'spinpol', spinpol
 
-    if 'Fermi' in dct:
-        yield 'fermi_level', float(dct['Fermi'][-1]) * Hartree
+    if fermi is not None:
+        yield 'fermi_level', float(fermi) * Hartree
 
-    if 'total force' in dct:
-        forces = []
-        for line in dct['total force']:
-            forces.append(line.split())
-        yield 'forces', np.array(forces, float) * (Hartree / Bohr)
+    if force_lines:
+        # Tokenize and parse all force rows in one C call instead of
+        # split() + float() per line:
+        forces = np.loadtxt(force_lines, ndmin=2)
+        yield 'forces', forces * (Hartree / Bohr)
 
 
 def parse_elk_eigval(fd):
+    """Parse EIGVAL.OUT-like file, streaming one k-point block at a time.
 
-    def match_int(line, word):
-        number, colon, word1 = line.split()
-        assert word1 == word
-        assert colon == ':'
-        return int(number)
+    The file can be large on dense k-grids, so we never materialize it
+    as a list of lines; memory use is O(nstsv), not O(file)."""
 
     def skip_spaces(line=''):
         while not line.strip():
             line = next(fd)
         return line
 
-    line = skip_spaces()
-    nkpts = match_int(line, 'nkpt')  # 10 : nkpts
-    line = next(fd)
-    nbands = match_int(line, 'nstsv')  # 15 : nstsv
+    # One scan for both header values ("10 : nkpt", "15 : nstsv"),
+    # breaking as soon as we have them, whichever order they come in:
+    nkpts = nbands = None
+    while nkpts is None or nbands is None:
+        number, colon, word = skip_spaces().split()
+        assert colon == ':', (number, colon, word)
+        if word == 'nkpt':
+            nkpts = int(number)
+        else:
+            assert word == 'nstsv', word
+            nbands = int(number)
 
     eigenvalues = np.empty((nkpts, nbands))
     occupations = np.empty((nkpts, nbands))
@@ -349,12 +385,12 @@ def parse_elk_eigval(fd):
 
         line = next(fd)  # "(state, eigenvalue and occupancy below)"
         assert line.strip().startswith('(state,'), line
-        for iband in range(nbands):
-            line = next(fd)
-            tokens = line.split()  # (band number, eigenval, occ)
-            assert iband + 1 == int(tokens[0])
-            eigenvalues[ikpt, iband] = float(tokens[1])
-            occupations[ikpt, iband] = float(tokens[2])
+        # The (band number, eigenval, occ) table parses much faster in
+        # one np.loadtxt call than with float() on individual tokens:
+        data = np.loadtxt(itertools.islice(fd, nbands), ndmin=2)
+        assert (data[:, 0] == np.arange(1, nbands + 1)).all()
+        eigenvalues[ikpt] = data[:, 1]
+        occupations[ikpt] = data[:, 2]
 
     yield 'ibz_kpoints', kpts
     yield 'eigenvalues', eigenvalues[None] * Hartree
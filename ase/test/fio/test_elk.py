@@ -6,7 +6,7 @@ import pytest
 
 from ase.build import bulk
 from ase.io import write
-from ase.io.elk import parse_elk_eigval, read_elk
+from ase.io.elk import ElkReader, parse_elk_eigval, read_elk
 from ase.units import Hartree, Bohr
 
 
@@ -52,6 +52,44 @@ def test_parse_eigval():
     assert pytest.approx(kpts) == [[0., 0., 0.], [0.0, 0.1, 0.2]]
 
 
+mock_elk_info_out = """
+Spin treatment       :
+   spin-unpolarised
+
+Fermi                       :   0.25
+total force                 :   0.1 0.2 0.3
+
+Convergence targets achieved
+"""
+
+mock_elk_kpoints_out = """     2 : nkpt; k-point, vkl, wkpt, nmat below
+     1   0.0 0.0 0.0   0.25   100
+     2   0.5 0.0 0.0   0.75   101
+"""
+
+
+def test_elkreader_cache(tmp_path):
+    """Outputs must be parsed once; later reads come from the cache."""
+    (tmp_path / 'TOTENERGY.OUT').write_text(' -1.0\n -2.5\n')
+    (tmp_path / 'INFO.OUT').write_text(mock_elk_info_out)
+    (tmp_path / 'EIGVAL.OUT').write_text(mock_elk_eigval_out)
+    (tmp_path / 'KPOINTS.OUT').write_text(mock_elk_kpoints_out)
+
+    reader = ElkReader(tmp_path)
+    first = reader.read_everything()
+    assert first.pop('converged')
+    assert first['energy'] == pytest.approx(-2.5 * Hartree)
+
+    # The second read must not touch the files again:
+    for path in tmp_path.glob('*.OUT'):
+        path.unlink()
+    second = reader.read_everything()
+    assert second.pop('converged')  # popped copies leave the cache intact
+    assert second.keys() == first.keys()
+    assert second['fermi_level'] == pytest.approx(0.25 * Hartree)
+    assert second['kpoint_weights'] == pytest.approx([0.25, 0.75])
+
+
 elk_geometry_out = """
 scale
  1.0
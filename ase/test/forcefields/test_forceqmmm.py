@@ -6,7 +6,6 @@ from ase.calculators.qmmm import ForceQMMM, RescaledCalculator
 from ase.eos import EquationOfState
 from ase.optimize import FIRE
 from ase.neighborlist import neighbor_list
-from ase.geometry import get_distances
 
 
 @pytest.fixture
@@ -47,6 +46,8 @@ def test_qm_buffer_mask(qm_calc, mm_calc, bulk_at):
     print("N_cell", N_cell_geom, 'N_MM', len(at0), "Size", N_cell_geom * alat)
     qm_rc = 5.37  # cutoff for EMC()
 
+    from scipy.spatial import cKDTree
+
     for R_QM in [1.0e-3,  # one atom in the center
                  alat / np.sqrt(2.0) + 1.0e-3,  # should give 12 nearest
                                                 # neighbours + central atom
@@ -56,15 +57,14 @@ def test_qm_buffer_mask(qm_calc, mm_calc, bulk_at):
         qm_mask = r < R_QM
         qm_buffer_mask_ref = r < 2 * qm_rc + R_QM
         # exclude atoms that are too far (in case of non spherical region)
-        # this is the old way to do it
-        _, r_qm_buffer = get_distances(at.positions[qm_buffer_mask_ref],
-                                       at.positions[qm_mask], at.cell, at.pbc)
-        updated_qm_buffer_mask = np.ones_like(at[qm_buffer_mask_ref])
-        for i, r_qm in enumerate(r_qm_buffer):
-            if r_qm.min() > 2 * qm_rc:
-                updated_qm_buffer_mask[i] = False
-
-        qm_buffer_mask_ref[qm_buffer_mask_ref] = updated_qm_buffer_mask
+        # query a periodic kd-tree of the qm atoms instead of building
+        # a dense (N_buf, N_qm) distance matrix just to take its min;
+        # boxsize handles the minimum image in this orthorhombic cell
+        tree = cKDTree(at.positions[qm_mask], boxsize=at.cell.lengths())
+        dists, _ = tree.query(at.positions[qm_buffer_mask_ref], k=1,
+                              distance_upper_bound=2 * qm_rc)
+
+        qm_buffer_mask_ref[qm_buffer_mask_ref] = np.isfinite(dists)
         '''
         print(f'R_QM             {R_QM}   N_QM        {qm_mask.sum()}')
         print(f'R_QM + buffer: {2 * qm_rc + R_QM:.2f}'
@@ -247,13 +247,18 @@ def test_rescaled_calculator():
                phi=np.array([[pair_potential]]), cutoff=cutoff, form='fs')
 
     # compute MM and QM equations of state
-    def strain(at, e, calc):
-        at = at.copy()
-        at.set_cell((1.0 + e) * at.cell, scale_atoms=True)
+    def strain(at0, calc, eps):
+        # reuse a single copy for all strains instead of cloning
+        # the atoms and reattaching the calculator per point
+        at = at0.copy()
         at.calc = calc
-        v = at.get_volume()
-        e = at.get_potential_energy()
-        return v, e
+        v = []
+        E = []
+        for e in eps:
+            at.set_cell((1.0 + e) * at0.cell, scale_atoms=True)
+            v.append(at.get_volume())
+            E.append(at.get_potential_energy())
+        return v, E
 
     # desired DFT values
     a0_qm = 3.18556
@@ -265,7 +270,7 @@ def test_rescaled_calculator():
 
     mm_calc = W_FS
     eps = np.linspace(-0.01, 0.01, 13)
-    v_mm, E_mm = zip(*[strain(bulk_at, e, mm_calc) for e in eps])
+    v_mm, E_mm = strain(bulk_at, mm_calc, eps)
 
     eos_mm = EquationOfState(v_mm, E_mm)
     v0_mm, E0_mm, B_mm = eos_mm.fit()
@@ -274,7 +279,7 @@ def test_rescaled_calculator():
 
     mm_r = RescaledCalculator(mm_calc, a0_qm, B_qm, a0_mm, B_mm)
     bulk_at = bulk("W", cubic=True, a=a0_qm)
-    v_mm_r, E_mm_r = zip(*[strain(bulk_at, e, mm_r) for e in eps])
+    v_mm_r, E_mm_r = strain(bulk_at, mm_r, eps)
 
     eos_mm_r = EquationOfState(v_mm_r, E_mm_r)
     v0_mm_r, E0_mm_r, B_mm_r = eos_mm_r.fit()
@@ -331,13 +336,14 @@ def test_forceqmmm(qm_calc, mm_calc, bulk_at):
     # compute error in energy norm |\nabla u - \nabla u_ref|
     def strain_error(at0, u_ref, u, cutoff, mask):
         I, J = neighbor_list('ij', at0, cutoff)
-        I, J = np.array([(i, j) for i, j in zip(I, J) if mask[i]]).T
+        keep = mask[I]
+        I, J = I[keep], J[keep]
         v = u_ref - u
         dv = np.linalg.norm(v[I, :] - v[J, :], axis=1)
         return np.linalg.norm(dv)
 
     du_global = [strain_error(at0, u_ref, u, 1.5 * sigma,
-                              np.ones(len(r))) for u in us]
+                              np.ones(len(r), dtype=bool)) for u in us]
     du_local = [strain_error(at0, u_ref, u, 1.5 * sigma, r < 3.0) for u in us]
 
     print('du_local', du_local)